@@ -1,20 +1,29 @@
 import asyncio
 import csv
+import functools
 import io
 import math
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-import requests
-from fastapi import FastAPI, HTTPException, Request
+import httpx
+import numpy as np
+import orjson
+import shapely
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field
+from shapely.errors import GEOSException
 from shapely.geometry import GeometryCollection, MultiPolygon, Polygon
 from shapely.geometry import mapping as geom_mapping
-from shapely.ops import transform, unary_union
+from shapely.ops import unary_union
 
 try:  # pragma: no cover - Shapely 1.x fallback
     from shapely.validation import make_valid
@@ -22,13 +31,50 @@ except ImportError:  # pragma: no cover - older Shapely
     def make_valid(geometry):
         return geometry.buffer(0)
 
+try:  # pragma: no cover - Redis is optional; caching degrades gracefully
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - no redis installed
+    aioredis = None
+    RedisError = ()
+
 
 EARTH_RADIUS_M = 6_378_137.0
+# Vertex-reduction tolerance (meters, applied after projection) before the
+# minimum rotated rectangle; coarse enough to shed detail, far below the
+# scale that would shift the long-edge bearing measurably.
+MRR_SIMPLIFY_TOLERANCE_M = 0.5
 USER_AGENT = "ChurchOrientationExplorer/1.0 (+https://example.com/contact)"
 OVERPASS_URL = "https://overpass-api.de/api/interpreter"
 NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
 BASE_DIR = Path(__file__).resolve().parent
 
+TILE_DEG = 0.05
+MAX_TILES = 256
+OVERPASS_CACHE_VERSION = "v1"
+OVERPASS_CACHE_TTL = 24 * 3600
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+_redis_client: Optional[Any] = None
+_redis_disabled = aioredis is None
+
+# Size of the default asyncio executor backing asyncio.to_thread; the stdlib
+# default of min(32, cpu + 4) throttles concurrent Overpass fetches and
+# geometry work under load. Applies per uvicorn worker process.
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "64"))
+
+# Element counts below this threshold are processed inline; forking worker
+# processes costs more than it saves for small result sets.
+PROCESS_POOL_MIN_ELEMENTS = 64
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _process_pool
+
 
 class BBox(BaseModel):
     north: float = Field(..., description="Northern latitude of the bbox")
@@ -44,7 +90,7 @@ class OrientationRequest(BaseModel):
     bbox: BBox
 
 
-app = FastAPI(title="Church Orientation Explorer")
+app = FastAPI(title="Church Orientation Explorer", default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -55,31 +101,117 @@ app.add_middleware(
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 app.state.last_result: Dict[str, Any] = {"features": [], "geojson": None}
+app.state.last_geojson_bytes: Optional[bytes] = None
 
 
-def _coords_to_polygon(coords: Iterable[Dict[str, float]]) -> Optional[Polygon]:
-    points = [(pt["lon"], pt["lat"]) for pt in coords]
-    if len(points) < 4:
-        return None
-    if points[0] != points[-1]:
-        points.append(points[0])
-    polygon = Polygon(points)
-    polygon = make_valid(polygon)
-    if polygon.is_empty:
+@app.on_event("startup")
+async def _configure_thread_pool() -> None:
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE, thread_name_prefix="church")
+    )
+
+
+@app.on_event("startup")
+async def _open_http_client() -> None:
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=90,
+        headers={"User-Agent": USER_AGENT},
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
+
+
+@app.on_event("shutdown")
+async def _close_http_client() -> None:
+    await app.state.http.aclose()
+
+
+def _ensure_valid(geometry: Any) -> Any:
+    # is_valid is a cheap predicate; make_valid runs a full GEOS repair,
+    # so only pay for it when the geometry actually needs fixing.
+    return geometry if geometry.is_valid else make_valid(geometry)
+
+
+def _ring_array(coords: Sequence[Dict[str, float]]) -> Optional[np.ndarray]:
+    if len(coords) < 4:
         return None
-    if isinstance(polygon, GeometryCollection):
-        polygons = [geom for geom in polygon.geoms if isinstance(geom, Polygon)]
+    arr = np.fromiter(
+        (value for point in coords for value in (point["lon"], point["lat"])),
+        dtype=np.float64,
+        count=2 * len(coords),
+    ).reshape(-1, 2)
+    if not np.array_equal(arr[0], arr[-1]):
+        arr = np.vstack([arr, arr[:1]])
+    return arr
+
+
+def _largest_polygon(geometry: Any) -> Optional[Polygon]:
+    if isinstance(geometry, GeometryCollection):
+        polygons = [geom for geom in geometry.geoms if isinstance(geom, Polygon)]
         if not polygons:
             return None
-        polygon = unary_union(polygons)
-    if isinstance(polygon, MultiPolygon):
-        polygons = [geom for geom in polygon.geoms if not geom.is_empty]
+        geometry = unary_union(polygons)
+    if isinstance(geometry, MultiPolygon):
+        polygons = [geom for geom in geometry.geoms if not geom.is_empty]
         if not polygons:
             return None
-        polygon = max(polygons, key=lambda geom: geom.area)
-    if not isinstance(polygon, Polygon) or polygon.is_empty:
+        geometry = max(polygons, key=lambda geom: geom.area)
+    if not isinstance(geometry, Polygon) or geometry.is_empty:
         return None
-    return polygon
+    return geometry
+
+
+def _polygon_from_ring(ring: np.ndarray) -> Optional[Polygon]:
+    polygon = _ensure_valid(Polygon(ring))
+    if polygon.is_empty:
+        return None
+    return _largest_polygon(polygon)
+
+
+def _coords_to_polygon(coords: Sequence[Dict[str, float]]) -> Optional[Polygon]:
+    arr = _ring_array(coords)
+    if arr is None:
+        return None
+    return _polygon_from_ring(arr)
+
+
+def _way_polygons(rings: List[np.ndarray]) -> List[Optional[Polygon]]:
+    """Construct polygons for many way rings through one shapely batch.
+
+    All rings are packed into a single flat coordinate buffer with an index
+    array, so ring and polygon construction happen as two C calls instead of
+    one Python-level constructor per way. Validity repair is applied only to
+    the rows that need it.
+    """
+    try:
+        coords = np.concatenate(rings)
+        indices = np.repeat(np.arange(len(rings)), [len(ring) for ring in rings])
+        polygons = shapely.polygons(shapely.linearrings(coords, indices=indices))
+    except (GEOSException, ValueError):
+        # One malformed ring poisons the whole batch; rebuild individually.
+        return [_polygon_from_ring(ring) for ring in rings]
+    invalid = ~shapely.is_valid(polygons)
+    if invalid.any():
+        polygons[invalid] = shapely.make_valid(polygons[invalid])
+    return [None if geom.is_empty else _largest_polygon(geom) for geom in polygons]
+
+
+# Chunk size for cascaded unions; unioning bounded groups first keeps the
+# intermediate geometries small for relations with many members.
+UNION_CHUNK = 64
+
+
+def _union_chunked(geoms: np.ndarray) -> Any:
+    while len(geoms) > UNION_CHUNK:
+        geoms = np.array(
+            [
+                shapely.union_all(geoms[i:i + UNION_CHUNK])
+                for i in range(0, len(geoms), UNION_CHUNK)
+            ],
+            dtype=object,
+        )
+    return shapely.union_all(geoms)
 
 
 def _element_to_geometry(element: Dict[str, Any]) -> Optional[Any]:
@@ -110,24 +242,23 @@ def _element_to_geometry(element: Dict[str, Any]) -> Optional[Any]:
 
         if not outers:
             if inners:
-                merged_inners = unary_union(inners)
+                merged_inners = _union_chunked(np.array(inners, dtype=object))
                 return merged_inners if not merged_inners.is_empty else None
             return None
 
-        inner_union = unary_union(inners) if inners else None
-        prepared: List[Any] = []
-        for outer in outers:
-            geom = make_valid(outer)
-            if inner_union and not inner_union.is_empty:
-                geom = geom.difference(inner_union)
-            if geom.is_empty:
-                continue
-            prepared.append(geom)
+        inner_union = _union_chunked(np.array(inners, dtype=object)) if inners else None
+        prepared = np.array(outers, dtype=object)
+        invalid = ~shapely.is_valid(prepared)
+        if invalid.any():
+            prepared[invalid] = shapely.make_valid(prepared[invalid])
+        if inner_union is not None and not inner_union.is_empty:
+            prepared = shapely.difference(prepared, inner_union)
+        prepared = prepared[~shapely.is_empty(prepared)]
 
-        if not prepared:
+        if len(prepared) == 0:
             return None
 
-        combined = unary_union(prepared)
+        combined = _union_chunked(prepared)
         return combined if not combined.is_empty else None
 
     return None
@@ -153,25 +284,37 @@ def _extract_main_polygon(geometry: Any) -> Optional[Polygon]:
     return None
 
 
-def _project_geometry(polygon: Polygon) -> Tuple[Any, float]:
-    reference_lat = polygon.representative_point().y
-    cos_ref = math.cos(math.radians(reference_lat)) or 1e-9
+@functools.lru_cache(maxsize=4096)
+def _cos_lat_bucket(bucket: int) -> float:
+    return math.cos(math.radians(bucket * 0.01)) or 1e-9
+
+
+def _cos_ref(lat: float) -> float:
+    # Bucketing to 0.01 degrees keeps the error below a meter over 10 km
+    # while letting neighbouring churches share one cosine evaluation.
+    return _cos_lat_bucket(int(lat * 100))
 
-    def _project(lon: float, lat: float, _: Optional[float] = None) -> Tuple[float, float]:
-        x = math.radians(lon) * EARTH_RADIUS_M * cos_ref
-        y = math.radians(lat) * EARTH_RADIUS_M
-        return x, y
 
-    projected = transform(_project, polygon)
-    return projected, reference_lat
+def _center_point(polygon: Polygon) -> Any:
+    centroid = polygon.centroid
+    if polygon.contains(centroid):
+        return centroid
+    # Concave footprints can push the centroid outside; only then pay for
+    # the interior-point solver.
+    return polygon.representative_point()
 
 
-def _dedupe_lengths(lengths: List[float]) -> List[float]:
-    unique: List[float] = []
-    for length in sorted(lengths, reverse=True):
-        if not unique or not math.isclose(length, unique[-1], rel_tol=1e-6, abs_tol=1e-6):
-            unique.append(length)
-    return unique
+def _project_geometry(polygon: Polygon) -> Tuple[Any, float, float]:
+    reference_lat = polygon.centroid.y
+    cos_ref = _cos_ref(reference_lat)
+
+    def _project(coords: np.ndarray) -> np.ndarray:
+        projected = np.radians(coords)
+        projected[:, 0] *= EARTH_RADIUS_M * cos_ref
+        projected[:, 1] *= EARTH_RADIUS_M
+        return projected
+
+    return shapely.transform(polygon, _project), reference_lat, cos_ref
 
 
 def _bearing_orientation(dx: float, dy: float) -> float:
@@ -186,47 +329,46 @@ def _deviation(angle: float, reference: float) -> float:
     return diff
 
 
-def _calculate_metrics(geometry: Any) -> Dict[str, Any]:
-    polygon = _extract_main_polygon(geometry)
+def _deviation_array(angles: np.ndarray, reference: float) -> np.ndarray:
+    diff = np.abs((angles - reference) % 360.0)
+    return np.where(diff > 180.0, 360.0 - diff, diff)
+
+
+def _calculate_metrics(polygon: Polygon) -> Dict[str, Any]:
+    # Callers extract the main polygon once in _process_elements; repeating
+    # _extract_main_polygon here would recompute areas for multi-part inputs.
     if polygon is None or polygon.is_empty:
         raise ValueError("No polygon geometry available for metrics calculation")
 
-    projected, reference_lat = _project_geometry(polygon)
+    projected, reference_lat, cos_ref = _project_geometry(polygon)
+    simplified = shapely.simplify(projected, MRR_SIMPLIFY_TOLERANCE_M, preserve_topology=False)
+    if not simplified.is_empty:
+        projected = simplified
     rectangle = projected.minimum_rotated_rectangle
-    coords = list(rectangle.exterior.coords)
-    if len(coords) < 5:
+    pts = shapely.get_coordinates(rectangle)
+    if len(pts) < 5:
         raise ValueError("Unable to derive oriented bounding box")
 
-    edge_lengths: List[float] = []
-    orientation = 0.0
-    longest = 0.0
-    for idx in range(4):
-        x1, y1 = coords[idx]
-        x2, y2 = coords[idx + 1]
-        dx = x2 - x1
-        dy = y2 - y1
-        length = math.hypot(dx, dy)
-        if length <= 0:
-            continue
-        edge_lengths.append(length)
-        if length > longest:
-            longest = length
-            orientation = _bearing_orientation(dx, dy)
-
-    if longest == 0.0 or not edge_lengths:
+    edges = pts[1:5] - pts[:4]
+    lengths = np.hypot(edges[:, 0], edges[:, 1])
+    longest_idx = int(lengths.argmax())
+    if lengths[longest_idx] <= 0.0:
         raise ValueError("Degenerate bounding rectangle")
-
-    unique_lengths = _dedupe_lengths(edge_lengths)
-    long_side = unique_lengths[0]
-    short_side = unique_lengths[1] if len(unique_lengths) > 1 else unique_lengths[0]
-    aspect_ratio = long_side / short_side if short_side > 0 else 0.0
+    orientation = _bearing_orientation(
+        float(edges[longest_idx, 0]), float(edges[longest_idx, 1])
+    )
+    # A rotated rectangle's edges are [a, b, a, b]; long and short side are
+    # simply the max and the smallest positive length.
+    long_side = float(lengths.max())
+    short_side = float(lengths[lengths > 0.0].min())
+    aspect_ratio = long_side / short_side
 
     orientation_deg = orientation % 360.0
     deviation_deg = min(_deviation(orientation_deg, 90.0), _deviation(orientation_deg, 270.0))
     signed_dev_deg = (orientation_deg % 180.0) - 90.0
     confidence = "high" if aspect_ratio >= 1.2 else "low"
 
-    center = polygon.representative_point()
+    center = _center_point(polygon)
     center_lon = center.x
     center_lat = center.y
 
@@ -234,7 +376,6 @@ def _calculate_metrics(geometry: Any) -> Dict[str, Any]:
     orientation_rad = math.radians(orientation_deg)
     dx = arrow_length * math.sin(orientation_rad)
     dy = arrow_length * math.cos(orientation_rad)
-    cos_ref = math.cos(math.radians(center_lat)) or 1e-9
     delta_lon = math.degrees(dx / (EARTH_RADIUS_M * cos_ref))
     delta_lat = math.degrees(dy / EARTH_RADIUS_M)
     arrow_lon = center_lon + delta_lon
@@ -253,6 +394,86 @@ def _calculate_metrics(geometry: Any) -> Dict[str, Any]:
     }
 
 
+def _batch_metrics(polygons: List[Polygon]) -> List[Optional[Dict[str, Any]]]:
+    """Compute orientation metrics for all polygons at once.
+
+    The minimum rotated rectangles are derived through shapely's vectorized
+    ufuncs and the per-edge math runs on a single ``(N, 4, 2)`` ndarray, so
+    the Python-level loop only remains for assembling the result dicts.
+    Polygons whose rectangle is degenerate fall back to the scalar
+    ``_calculate_metrics`` path.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(polygons)
+    if not polygons:
+        return results
+
+    projected = np.empty(len(polygons), dtype=object)
+    cos_refs = np.empty(len(polygons))
+    for i, polygon in enumerate(polygons):
+        projected[i], _, cos_refs[i] = _project_geometry(polygon)
+    simplified = shapely.simplify(projected, MRR_SIMPLIFY_TOLERANCE_M, preserve_topology=False)
+    projected = np.where(shapely.is_empty(simplified), projected, simplified)
+    rects = shapely.minimum_rotated_rectangle(projected)
+    valid = shapely.get_num_coordinates(rects) == 5
+
+    if valid.any():
+        corners = shapely.get_coordinates(rects[valid]).reshape(-1, 5, 2)
+        edges = np.diff(corners, axis=1)
+        lengths = np.hypot(edges[..., 0], edges[..., 1])
+        longest_idx = lengths.argmax(axis=1)
+        dx = np.take_along_axis(edges[..., 0], longest_idx[:, None], axis=1)[:, 0]
+        dy = np.take_along_axis(edges[..., 1], longest_idx[:, None], axis=1)[:, 0]
+        orientation = (np.degrees(np.arctan2(dx, dy)) + 360.0) % 360.0
+        long_side = lengths.max(axis=1)
+        short_side = lengths.min(axis=1)
+        aspect_ratio = np.divide(
+            long_side, short_side, out=np.zeros_like(long_side), where=short_side > 0
+        )
+        deviation = np.minimum(
+            _deviation_array(orientation, 90.0), _deviation_array(orientation, 270.0)
+        )
+        signed_dev = (orientation % 180.0) - 90.0
+
+        # The rectangle center is the mean of the four distinct corners -
+        # free, given the corner array, where a per-polygon centroid or
+        # point_on_surface would each be another GEOS call. Unproject with
+        # the same cos_ref used by the forward projection.
+        cos_ref = cos_refs[valid]
+        center_xy = corners[:, :4, :].mean(axis=1)
+        center_lon = np.degrees(center_xy[:, 0] / (EARTH_RADIUS_M * cos_ref))
+        center_lat = np.degrees(center_xy[:, 1] / EARTH_RADIUS_M)
+
+        arrow_length = np.clip(long_side * 0.5, 30.0, 150.0)
+        orientation_rad = np.radians(orientation)
+        arrow_dx = arrow_length * np.sin(orientation_rad)
+        arrow_dy = arrow_length * np.cos(orientation_rad)
+        arrow_lon = center_lon + np.degrees(arrow_dx / (EARTH_RADIUS_M * cos_ref))
+        arrow_lat = center_lat + np.degrees(arrow_dy / EARTH_RADIUS_M)
+
+        for row, i in enumerate(np.flatnonzero(valid)):
+            if long_side[row] <= 0.0:
+                continue
+            results[i] = {
+                "orientation_deg": float(orientation[row]),
+                "deviation_deg": float(deviation[row]),
+                "signed_dev_deg": float(signed_dev[row]),
+                "aspect_ratio": float(aspect_ratio[row]),
+                "confidence": "high" if aspect_ratio[row] >= 1.2 else "low",
+                "center_lon": float(center_lon[row]),
+                "center_lat": float(center_lat[row]),
+                "arrow_lon": float(arrow_lon[row]),
+                "arrow_lat": float(arrow_lat[row]),
+            }
+
+    for i, polygon in enumerate(polygons):
+        if results[i] is None:
+            try:
+                results[i] = _calculate_metrics(polygon)
+            except ValueError:
+                results[i] = None
+    return results
+
+
 def _build_query(bbox: BBox) -> str:
     south, west, north, east = bbox.as_tuple()
     return (
@@ -269,21 +490,50 @@ def _process_elements(elements: List[Dict[str, Any]]) -> Dict[str, Any]:
     features: List[Dict[str, Any]] = []
     geo_features: List[Dict[str, Any]] = []
 
+    # Ways (the vast majority of elements) are collected as raw ring arrays
+    # and constructed in one shapely batch; relations keep the per-element
+    # path, which already validates and drops empty geometries.
+    pending: List[Tuple[Dict[str, Any], Any]] = []
+    way_rings: List[np.ndarray] = []
+    way_slots: List[int] = []
     for element in elements:
-        geometry = _element_to_geometry(element)
+        if element.get("type") == "way":
+            ring = _ring_array(element.get("geometry", []))
+            if ring is None:
+                continue
+            way_slots.append(len(pending))
+            way_rings.append(ring)
+            pending.append((element, None))
+        else:
+            geometry = _element_to_geometry(element)
+            if geometry is None or geometry.is_empty:
+                continue
+            pending.append((element, geometry))
+
+    if way_rings:
+        for slot, polygon in zip(way_slots, _way_polygons(way_rings)):
+            pending[slot] = (pending[slot][0], polygon)
+
+    prepared: List[Tuple[Dict[str, Any], Any, Polygon]] = []
+    for element, geometry in pending:
         if geometry is None or geometry.is_empty:
             continue
-        geometry = make_valid(geometry)
-        if geometry.is_empty:
+        polygon = _extract_main_polygon(geometry)
+        if polygon is None or polygon.is_empty:
             continue
-        try:
-            metrics = _calculate_metrics(geometry)
-        except ValueError:
+        prepared.append((element, geometry, polygon))
+
+    metrics_list = _batch_metrics([polygon for _, _, polygon in prepared])
+
+    for (element, geometry, polygon), metrics in zip(prepared, metrics_list):
+        if metrics is None:
             continue
 
         tags = element.get("tags", {})
         name = tags.get("name") if isinstance(tags.get("name"), str) else None
 
+        # One dict serves both the table row and the GeoJSON properties;
+        # copying it per feature was pure allocation overhead.
         feature_entry = {
             "name": name,
             "lat": metrics["center_lat"],
@@ -295,17 +545,13 @@ def _process_elements(elements: List[Dict[str, Any]]) -> Dict[str, Any]:
             "confidence": metrics["confidence"],
             "arrow_lat": metrics["arrow_lat"],
             "arrow_lon": metrics["arrow_lon"],
-        }
-        features.append(feature_entry)
-
-        properties = {
-            **feature_entry,
             "osm_id": f"{element.get('type')}/{element.get('id')}",
         }
+        features.append(feature_entry)
         geo_features.append({
             "type": "Feature",
-            "geometry": geom_mapping(geometry),
-            "properties": properties,
+            "geometry": _geometry_to_geojson(geometry),
+            "properties": feature_entry,
         })
 
     return {
@@ -314,71 +560,284 @@ def _process_elements(elements: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
-async def _fetch_orientation(bbox: BBox) -> Dict[str, Any]:
+async def _fetch_elements(bbox: BBox) -> List[Dict[str, Any]]:
     query = _build_query(bbox)
+    try:
+        response = await app.state.http.post(OVERPASS_URL, data={"data": query})
+        response.raise_for_status()
+    except httpx.HTTPError as exc:  # pragma: no cover - network failure
+        raise HTTPException(status_code=502, detail="Overpass API request failed") from exc
+    # Overpass payloads run to many MB of coordinate floats; orjson parses
+    # them several times faster than response.json().
+    data = orjson.loads(response.content)
+    return data.get("elements", [])
+
+
+def _tile_ranges(bbox: BBox) -> Tuple[range, range]:
+    south, west, north, east = bbox.as_tuple()
+    ix_min = math.floor(west / TILE_DEG)
+    ix_max = math.floor(east / TILE_DEG)
+    iy_min = math.floor(south / TILE_DEG)
+    iy_max = math.floor(north / TILE_DEG)
+    return range(ix_min, ix_max + 1), range(iy_min, iy_max + 1)
+
+
+def _tile_bbox(ix: int, iy: int) -> BBox:
+    return BBox(
+        north=(iy + 1) * TILE_DEG,
+        south=iy * TILE_DEG,
+        east=(ix + 1) * TILE_DEG,
+        west=ix * TILE_DEG,
+    )
+
+
+def _tile_key(ix: int, iy: int) -> str:
+    return f"overpass:{OVERPASS_CACHE_VERSION}:{ix}:{iy}"
+
+
+def _element_intersects_bbox(element: Dict[str, Any], bbox: BBox) -> bool:
+    south, west, north, east = bbox.as_tuple()
+    bounds = element.get("bounds")
+    if not isinstance(bounds, dict):
+        # Without bounds we cannot cheaply decide; keep the element.
+        return True
+    return not (
+        bounds.get("maxlat", north) < south
+        or bounds.get("minlat", south) > north
+        or bounds.get("maxlon", east) < west
+        or bounds.get("minlon", west) > east
+    )
+
 
-    def _request() -> Dict[str, Any]:
+def _get_redis() -> Optional[Any]:
+    global _redis_client, _redis_disabled
+    if _redis_disabled:
+        return None
+    if _redis_client is None:
         try:
-            response = requests.post(
-                OVERPASS_URL,
-                data={"data": query},
-                headers={"User-Agent": USER_AGENT},
-                timeout=90,
-            )
-            response.raise_for_status()
-        except requests.RequestException as exc:  # pragma: no cover - network failure
-            raise HTTPException(status_code=502, detail="Overpass API request failed") from exc
-        data = response.json()
-        elements = data.get("elements", [])
-        return _process_elements(elements)
+            _redis_client = aioredis.from_url(REDIS_URL)
+        except (RedisError, ValueError):  # pragma: no cover - bad REDIS_URL
+            _redis_disabled = True
+            return None
+    return _redis_client
 
-    return await asyncio.to_thread(_request)
+
+async def _fetch_elements_cached(bbox: BBox) -> List[Dict[str, Any]]:
+    global _redis_disabled
+    xs, ys = _tile_ranges(bbox)
+    tiles = [(ix, iy) for iy in ys for ix in xs]
+    if len(tiles) > MAX_TILES:
+        # Huge viewport: one direct query beats hammering Overpass per tile.
+        return await _fetch_elements(bbox)
+
+    cached: List[Optional[bytes]] = [None] * len(tiles)
+    redis_client = _get_redis()
+    if redis_client is not None:
+        try:
+            cached = await redis_client.mget([_tile_key(ix, iy) for ix, iy in tiles])
+        except RedisError:  # pragma: no cover - Redis unavailable
+            _redis_disabled = True
+            redis_client = None
+            cached = [None] * len(tiles)
+
+    tile_elements: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+    misses: List[Tuple[int, int]] = []
+    for tile, payload in zip(tiles, cached):
+        if payload is None:
+            misses.append(tile)
+        else:
+            tile_elements[tile] = orjson.loads(payload)
+
+    if misses:
+        fetched = await asyncio.gather(
+            *(_fetch_elements(_tile_bbox(ix, iy)) for ix, iy in misses)
+        )
+        for tile, elements in zip(misses, fetched):
+            tile_elements[tile] = elements
+            if redis_client is not None:
+                try:
+                    await redis_client.setex(
+                        _tile_key(*tile), OVERPASS_CACHE_TTL, orjson.dumps(elements)
+                    )
+                except RedisError:  # pragma: no cover - Redis unavailable
+                    _redis_disabled = True
+                    redis_client = None
+
+    merged: List[Dict[str, Any]] = []
+    seen: set = set()
+    for tile in tiles:
+        for element in tile_elements.get(tile, []):
+            key = (element.get("type"), element.get("id"))
+            if key in seen:
+                continue
+            seen.add(key)
+            if _element_intersects_bbox(element, bbox):
+                merged.append(element)
+    return merged
+
+
+def _polygon_coordinates(polygon: Polygon) -> List[np.ndarray]:
+    # float32 keeps ~1 m precision at building scale and halves the payload;
+    # ORJSONResponse serializes the ndarrays directly (OPT_SERIALIZE_NUMPY).
+    rings = [shapely.get_coordinates(polygon.exterior).astype(np.float32)]
+    for interior in polygon.interiors:
+        rings.append(shapely.get_coordinates(interior).astype(np.float32))
+    return rings
+
+
+def _geometry_to_geojson(geometry: Any) -> Dict[str, Any]:
+    """GeoJSON mapping via bulk coordinate extraction.
+
+    ``shapely.geometry.mapping`` walks every vertex in Python; pulling each
+    ring out as one ndarray keeps the per-feature cost at a handful of C
+    calls. Non-polygonal geometries fall back to ``mapping``.
+    """
+    if isinstance(geometry, Polygon):
+        return {"type": "Polygon", "coordinates": _polygon_coordinates(geometry)}
+    if isinstance(geometry, MultiPolygon):
+        return {
+            "type": "MultiPolygon",
+            "coordinates": [_polygon_coordinates(part) for part in geometry.geoms],
+        }
+    return geom_mapping(geometry)
+
+
+def _merge_results(parts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    features: List[Dict[str, Any]] = []
+    geo_features: List[Dict[str, Any]] = []
+    for part in parts:
+        features.extend(part["features"])
+        geo_features.extend(part["geojson"]["features"])
+    return {
+        "features": features,
+        "geojson": {"type": "FeatureCollection", "features": geo_features},
+    }
+
+
+# Fully processed results per bbox, so repeated pans over the exact same
+# viewport skip the tile merge and geometry pipeline entirely. Keys are
+# quantized to 5 decimals (~1 m), enough to absorb float jitter from the UI.
+RESULT_CACHE_TTL = 3600
+RESULT_CACHE_MAX = 128
+_result_cache: "OrderedDict[Tuple[float, ...], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _bbox_cache_key(bbox: BBox) -> Tuple[float, ...]:
+    return tuple(round(value, 5) for value in bbox.as_tuple())
+
+
+async def _fetch_orientation(bbox: BBox) -> Dict[str, Any]:
+    key = _bbox_cache_key(bbox)
+    cached = _result_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _result_cache.move_to_end(key)
+        return cached[1]
+
+    result = await _compute_orientation(bbox)
+    _result_cache[key] = (time.monotonic() + RESULT_CACHE_TTL, result)
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > RESULT_CACHE_MAX:
+        _result_cache.popitem(last=False)
+    return result
+
+
+async def _compute_orientation(bbox: BBox) -> Dict[str, Any]:
+    elements = await _fetch_elements_cached(bbox)
+    workers = os.cpu_count() or 1
+    if workers == 1 or len(elements) < PROCESS_POOL_MIN_ELEMENTS:
+        return await asyncio.to_thread(_process_elements, elements)
+
+    chunk_size = math.ceil(len(elements) / workers)
+    chunks = [elements[i:i + chunk_size] for i in range(0, len(elements), chunk_size)]
+    loop = asyncio.get_running_loop()
+    parts = await asyncio.gather(
+        *(loop.run_in_executor(_get_process_pool(), _process_elements, chunk) for chunk in chunks)
+    )
+    return _merge_results(parts)
+
+
+# Nominatim usage policy allows at most one request per second; the lock
+# serializes callers and the timestamp lets an idle service skip the wait.
+NOMINATIM_MIN_INTERVAL = 1.0
+_nominatim_lock = asyncio.Lock()
+_last_nominatim = 0.0
+
+
+async def _nominatim_throttle() -> None:
+    global _last_nominatim
+    async with _nominatim_lock:
+        wait = NOMINATIM_MIN_INTERVAL - (time.monotonic() - _last_nominatim)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        _last_nominatim = time.monotonic()
+
+
+GEOCODE_CACHE_TTL = 24 * 3600
+GEOCODE_CACHE_MAX = 4096
+_geocode_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
 
 
 async def _geocode_city(query: str) -> Dict[str, Any]:
+    cache_key = query.strip().casefold()
+    cached = _geocode_cache.get(cache_key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    result = await _geocode_city_uncached(query)
+    if len(_geocode_cache) >= GEOCODE_CACHE_MAX:
+        # Evict the entries closest to expiry rather than tracking LRU order.
+        for stale in sorted(_geocode_cache, key=lambda k: _geocode_cache[k][0])[
+            : GEOCODE_CACHE_MAX // 4
+        ]:
+            del _geocode_cache[stale]
+    _geocode_cache[cache_key] = (time.monotonic() + GEOCODE_CACHE_TTL, result)
+    return result
+
+
+async def _geocode_city_uncached(query: str) -> Dict[str, Any]:
     params = {"q": query, "format": "json", "limit": 1}
 
-    async def _throttled_request() -> Dict[str, Any]:
-        await asyncio.sleep(1.0)
-
-        def _request() -> Dict[str, Any]:
-            try:
-                response = requests.get(
-                    NOMINATIM_URL,
-                    params=params,
-                    headers={"User-Agent": USER_AGENT, "Accept-Language": "en"},
-                    timeout=30,
-                )
-                response.raise_for_status()
-            except requests.RequestException as exc:  # pragma: no cover - network failure
-                raise HTTPException(status_code=502, detail="Nominatim request failed") from exc
-            data = response.json()
-            if not data:
-                raise HTTPException(status_code=404, detail="City not found")
-            item = data[0]
-            bounding = item.get("boundingbox")
-            if not bounding or len(bounding) != 4:
-                raise HTTPException(status_code=500, detail="Geocoding result is missing a bounding box")
-            south, north, west, east = map(float, bounding)
-            return {
-                "lat": float(item["lat"]),
-                "lon": float(item["lon"]),
-                "bbox": {
-                    "north": north,
-                    "south": south,
-                    "east": east,
-                    "west": west,
-                },
-            }
+    await _nominatim_throttle()
+    try:
+        response = await app.state.http.get(
+            NOMINATIM_URL,
+            params=params,
+            headers={"Accept-Language": "en"},
+            timeout=30,
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as exc:  # pragma: no cover - network failure
+        raise HTTPException(status_code=502, detail="Nominatim request failed") from exc
+    data = response.json()
+    if not data:
+        raise HTTPException(status_code=404, detail="City not found")
+    item = data[0]
+    bounding = item.get("boundingbox")
+    if not bounding or len(bounding) != 4:
+        raise HTTPException(status_code=500, detail="Geocoding result is missing a bounding box")
+    south, north, west, east = map(float, bounding)
+    return {
+        "lat": float(item["lat"]),
+        "lon": float(item["lon"]),
+        "bbox": {
+            "north": north,
+            "south": south,
+            "east": east,
+            "west": west,
+        },
+    }
 
-        return await asyncio.to_thread(_request)
 
-    return await _throttled_request()
+@functools.lru_cache(maxsize=1)
+def _render_index() -> str:
+    # The template references neither request nor url_for, so the rendered
+    # HTML is identical for every visitor and can be produced once.
+    return templates.get_template("index.html").render({})
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request) -> HTMLResponse:
-    return templates.TemplateResponse("index.html", {"request": request})
+async def index() -> HTMLResponse:
+    return HTMLResponse(_render_index())
 
 
 @app.get("/api/search_city")
@@ -387,10 +846,18 @@ async def search_city(query: str) -> Dict[str, Any]:
 
 
 @app.post("/api/orientation")
-async def orientation(request: OrientationRequest) -> JSONResponse:
+async def orientation(request: OrientationRequest) -> ORJSONResponse:
     result = await _fetch_orientation(request.bbox)
     app.state.last_result = result
-    return JSONResponse(result)
+    # Serialize the export payload once here so /api/export.geojson becomes
+    # a plain byte write instead of re-encoding the FeatureCollection.
+    if result["geojson"]["features"]:
+        app.state.last_geojson_bytes = orjson.dumps(
+            result["geojson"], option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    else:
+        app.state.last_geojson_bytes = None
+    return ORJSONResponse(result)
 
 
 @app.get("/api/export.csv")
@@ -400,49 +867,56 @@ async def export_csv() -> StreamingResponse:
     if not features:
         raise HTTPException(status_code=404, detail="No results available. Run a search first.")
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(
-        [
-            "name",
-            "lat",
-            "lon",
-            "orientation_deg",
-            "deviation_deg",
-            "signed_dev_deg",
-            "aspect_ratio",
-            "confidence",
-        ]
-    )
-    for feature in features:
-        writer.writerow(
+    def _rows() -> Iterable[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def _encode(values: List[Any]) -> str:
+            writer.writerow(values)
+            line = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return line
+
+        yield _encode(
             [
-                feature.get("name", "") or "",
-                f"{feature['lat']:.6f}",
-                f"{feature['lon']:.6f}",
-                f"{feature['orientation_deg']:.2f}",
-                f"{feature['deviation_deg']:.2f}",
-                f"{feature['signed_dev_deg']:.2f}",
-                f"{feature['aspect_ratio']:.2f}",
-                feature.get("confidence", ""),
+                "name",
+                "lat",
+                "lon",
+                "orientation_deg",
+                "deviation_deg",
+                "signed_dev_deg",
+                "aspect_ratio",
+                "confidence",
             ]
         )
+        for feature in features:
+            yield _encode(
+                [
+                    feature.get("name", "") or "",
+                    f"{feature['lat']:.6f}",
+                    f"{feature['lon']:.6f}",
+                    f"{feature['orientation_deg']:.2f}",
+                    f"{feature['deviation_deg']:.2f}",
+                    f"{feature['signed_dev_deg']:.2f}",
+                    f"{feature['aspect_ratio']:.2f}",
+                    feature.get("confidence", ""),
+                ]
+            )
 
-    output.seek(0)
     return StreamingResponse(
-        output,
+        _rows(),
         media_type="text/csv; charset=utf-8",
         headers={"Content-Disposition": 'attachment; filename="church_orientation.csv"'},
     )
 
 
 @app.get("/api/export.geojson")
-async def export_geojson() -> JSONResponse:
-    last_result = app.state.last_result
-    geojson = last_result.get("geojson") if isinstance(last_result, dict) else None
-    if not geojson or not geojson.get("features"):
+async def export_geojson() -> Response:
+    payload = app.state.last_geojson_bytes
+    if not payload:
         raise HTTPException(status_code=404, detail="No results available. Run a search first.")
-    return JSONResponse(geojson)
+    return Response(payload, media_type="application/geo+json")
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI usage